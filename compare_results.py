@@ -6,10 +6,25 @@ Compare multiple benchmark results and generate a summary report
 import json
 import os
 import sys
-import re
 from pathlib import Path
 from datetime import datetime
 
+# Injector statistics line:
+#   Elapsed: 10.5s | Messages: 10500 | Rate: 1000.00 msg/s | Throughput: 125.50 KB/s | Errors: 0
+def parse_stats_line(line):
+    """Parse an injector statistics line into (elapsed, messages, rate, throughput, errors)"""
+    try:
+        fields = dict(field.split(': ', 1) for field in line.split(' | '))
+        return (
+            float(fields['Elapsed'].rstrip('s')),
+            int(fields['Messages']),
+            float(fields['Rate'].split()[0]),
+            float(fields['Throughput'].split()[0]),
+            int(fields['Errors']),
+        )
+    except (KeyError, IndexError, ValueError):
+        return None  # Truncated or malformed line
+
 def parse_result_file(filepath):
     """Parse a benchmark result file and extract metrics"""
     metrics = {
@@ -22,32 +37,26 @@ def parse_result_file(filepath):
         'errors': 0
     }
 
+    have_stats = False
     with open(filepath, 'r') as f:
-        content = f.read()
-
-        # Extract timestamp
-        ts_match = re.search(r'Timestamp: (\d{8}_\d{6})', content)
-        if ts_match:
-            metrics['timestamp'] = ts_match.group(1)
-
-        # Extract config
-        cfg_match = re.search(r'Injector Config: (.+)', content)
-        if cfg_match:
-            metrics['config'] = cfg_match.group(1)
-
-        # Extract final statistics
-        stats_match = re.search(
-            r'Elapsed: ([\d.]+)s.*?Messages: (\d+).*?Rate: ([\d.]+) msg/s.*?Throughput: ([\d.]+) KB/s.*?Errors: (\d+)',
-            content,
-            re.DOTALL
-        )
-
-        if stats_match:
-            metrics['elapsed'] = float(stats_match.group(1))
-            metrics['messages'] = int(stats_match.group(2))
-            metrics['rate'] = float(stats_match.group(3))
-            metrics['throughput'] = float(stats_match.group(4))
-            metrics['errors'] = int(stats_match.group(5))
+        # Text mode splits on '\r' too, so each progress update is its own line
+        for line in f:
+            if line.startswith('Timestamp: '):
+                if metrics['timestamp'] is None:
+                    metrics['timestamp'] = line[len('Timestamp: '):].strip()
+            elif line.startswith('Injector Config: '):
+                if metrics['config'] is None:
+                    metrics['config'] = line[len('Injector Config: '):].rstrip('\n')
+            elif line.startswith('Elapsed: ') and not have_stats:
+                stats = parse_stats_line(line)
+                if stats:
+                    (metrics['elapsed'], metrics['messages'], metrics['rate'],
+                     metrics['throughput'], metrics['errors']) = stats
+                    have_stats = True
+
+            # Header comes first, so stop reading once everything is found
+            if have_stats and metrics['timestamp'] is not None and metrics['config'] is not None:
+                break
 
     return metrics
 
@@ -4,88 +4,254 @@ Validate data integrity by querying OpenSearch and checking for gaps/missing mes
 """
 
 import argparse
+import base64
+import heapq
 import json
 import sys
 import re
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+import http.client
 import ssl
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import compress
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: vectorizes integrity checks on large indices
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Optional: JIT-compiles the integrity scan (requires NumPy)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: faster decoding of large scroll pages
+
+# Request/response bodies as bytes, via orjson when available
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
+
+_COUNTER_PREFIX = 'Test message #'
+_COUNTER_PREFIX_LEN = len(_COUNTER_PREFIX)
+_COUNTER_RE = re.compile(r'Test message #(\d+)')
+# Whole-line form, for extracting a page of newline-joined messages in one call
+_COUNTER_LINE_RE = re.compile(r'^Test message #(\d+)$', re.MULTILINE)
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_sorted(arr):
+        """Single pass over sorted counters: (unique, dup values, dup counts, gap starts, gap ends)"""
+        dup_vals = []
+        dup_counts = []
+        gap_starts = []
+        gap_ends = []
+        unique = 1
+        run = 1
+        for i in range(1, arr.shape[0]):
+            if arr[i] == arr[i - 1]:
+                run += 1
+                continue
+            if run > 1:
+                dup_vals.append(arr[i - 1])
+                dup_counts.append(run)
+            if arr[i] != arr[i - 1] + 1:
+                gap_starts.append(arr[i - 1] + 1)
+                gap_ends.append(arr[i] - 1)
+            unique += 1
+            run = 1
+        if run > 1:
+            dup_vals.append(arr[arr.shape[0] - 1])
+            dup_counts.append(run)
+        return unique, dup_vals, dup_counts, gap_starts, gap_ends
+
+    # Compile (or load from the on-disk cache) now rather than during the first validation
+    _scan_sorted(np.array([1, 1, 3], dtype=np.int64))
+else:
+    _scan_sorted = None
+
+# Painless scripts for the --agg-only path. Counters are extracted on the shards
+# and histogrammed into blocks of _AGG_BLOCK values; each block also carries a
+# bitset of the values seen, so its exact distinct count costs _AGG_BLOCK bits
+# per shard instead of one list entry per document.
+_AGG_BLOCK = 10000
+# Blocks failing the completeness check each cost one more pass over the index;
+# past this many, scrolling the documents is cheaper
+_AGG_MAX_EXACT_BLOCKS = 20
+_AGG_COUNTER_PARSE = """
+long counter = -1;
+if (doc.containsKey('message.keyword') && doc['message.keyword'].size() > 0) {
+  String m = doc['message.keyword'].value;
+  int i = m.indexOf('Test message #');
+  while (i >= 0 && counter < 0) {
+    int start = i + 14;
+    int end = start;
+    while (end < m.length() && m.charAt(end) >= 48 && m.charAt(end) <= 57) { end++; }
+    if (end > start) { counter = Long.parseLong(m.substring(start, end)); }
+    else { i = m.indexOf('Test message #', i + 1); }
+  }
+}
+"""
+_AGG_COUNTER_SCRIPT = _AGG_COUNTER_PARSE + """
+if (counter < 0) { return null; }
+return counter;
+"""
+_AGG_BITS_MAP_SCRIPT = _AGG_COUNTER_PARSE + """
+if (counter >= 0) {
+  int slot = (int) (counter % params.block);
+  state.bits[slot >> 6] |= 1L << (slot & 63);
+}
+"""
+_AGG_BITS_REDUCE_SCRIPT = """
+long[] bits = new long[params.words];
+for (def s : states) {
+  if (s != null) { for (int w = 0; w < bits.length; ++w) { bits[w] |= s[w]; } }
+}
+long n = 0;
+for (int w = 0; w < bits.length; ++w) { n += Long.bitCount(bits[w]); }
+return n;
+"""
+
+# Response fields needed from each scroll page; drops _index, _score, sort values, shard info etc.
+# Note that an empty page then comes back without a 'hits' key at all.
+_SCROLL_FILTER_PATH = '_scroll_id,hits.hits._id,hits.hits._source'
+# Counting into an occupancy array needs nothing but the messages
+_SCROLL_MESSAGE_FILTER_PATH = '_scroll_id,hits.hits._source.message'
+
+def open_connection(host, port, use_ssl=True, timeout=30):
+    """Open an HTTP(S) connection to OpenSearch that can be reused across requests"""
+    if not use_ssl:
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    # Create SSL context that doesn't verify certificates
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return http.client.HTTPSConnection(host, port, context=ctx, timeout=timeout)
+
+def send_request(conn, method, path, body, headers, retry_after_send=True):
+    """Send a request on a kept-alive connection, reconnecting once if the server had dropped it
+
+    A retry only happens on a reused connection, and only when the request cannot
+    have been processed: sending it failed, or (if retry_after_send) the server
+    closed the connection without any response bytes. Requests that must not run
+    twice, like scroll continuations, pass retry_after_send=False. Failures while
+    reading a response are never retried.
+    """
+    reused = conn.sock is not None
+    try:
+        conn.request(method, path, body=body, headers=headers)
+    except ConnectionError:
+        conn.close()
+        if not reused:
+            raise
+        conn.request(method, path, body=body, headers=headers)  # Reconnects
+        reused = False
+
+    try:
+        response = conn.getresponse()
+    except http.client.RemoteDisconnected:
+        conn.close()
+        if not (reused and retry_after_send):
+            raise
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+
+    return response.status, response.reason, response.read()
+
+def basic_auth_header(user, password):
+    """Build the Authorization header value, or None without credentials"""
+    if user and password:
+        credentials = base64.b64encode(f"{user}:{password}".encode()).decode()
+        return f'Basic {credentials}'
+    return None
 
-def query_opensearch(host, port, index, user, password, query, use_ssl=True, scroll=None, is_scroll_request=False, path_prefix=''):
-    """Query OpenSearch API"""
-    protocol = "https" if use_ssl else "http"
-    base = f"{protocol}://{host}:{port}{path_prefix}"
+def query_opensearch(host, port, index, auth_header, query, use_ssl=True, scroll=None, is_scroll_request=False, path_prefix='', conn=None, filter_path=None):
+    """Query OpenSearch API, on conn if given or on a one-off connection otherwise"""
+    params = []
 
     if is_scroll_request:
         # Scroll continuation request
-        url = f"{base}/_search/scroll"
+        path = f"{path_prefix}/_search/scroll"
         query_body = {
             "scroll": scroll,
             "scroll_id": query  # query contains the scroll_id
         }
     else:
         # Regular search request
+        path = f"{path_prefix}/{index}/_search"
         if scroll:
             # Initial search with scroll - pass scroll as URL parameter
-            url = f"{base}/{index}/_search?scroll={scroll}"
-        else:
-            url = f"{base}/{index}/_search"
+            params.append(f"scroll={scroll}")
         query_body = query
 
+    if filter_path:
+        # Only return the listed response fields
+        params.append(f"filter_path={filter_path}")
+
+    if params:
+        path += '?' + '&'.join(params)
+
     headers = {
         'Content-Type': 'application/json',
     }
 
-    # Create auth header
-    if user and password:
-        import base64
-        credentials = base64.b64encode(f"{user}:{password}".encode()).decode()
-        headers['Authorization'] = f'Basic {credentials}'
+    if auth_header:
+        headers['Authorization'] = auth_header
 
-    # Create SSL context that doesn't verify certificates
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-
-    req = Request(url, data=json.dumps(query_body).encode(), headers=headers, method='POST')
+    own_conn = conn is None
+    if own_conn:
+        conn = open_connection(host, port, use_ssl)
 
     try:
-        with urlopen(req, context=ctx, timeout=30) as response:
-            return json.loads(response.read().decode())
-    except HTTPError as e:
-        print(f"HTTP Error: {e.code} - {e.reason}")
-        print(e.read().decode())
+        # A replayed scroll continuation would advance the scroll twice and skip a page
+        status, reason, data = send_request(conn, 'POST', path, _json_dumps(query_body), headers,
+                                            retry_after_send=not is_scroll_request)
+    except (OSError, http.client.HTTPException) as e:
+        print(f"Connection Error: {e}")
         sys.exit(1)
-    except URLError as e:
-        print(f"URL Error: {e.reason}")
+    finally:
+        if own_conn:
+            conn.close()
+
+    if status >= 400:
+        print(f"HTTP Error: {status} - {reason}")
+        print(data.decode())
         sys.exit(1)
 
-def clear_scroll(host, port, scroll_id, user, password, use_ssl=True, path_prefix=''):
+    return _json_loads(data)
+
+def clear_scroll(host, port, scroll_id, auth_header, use_ssl=True, path_prefix='', conn=None):
     """Clear scroll context"""
-    protocol = "https" if use_ssl else "http"
-    url = f"{protocol}://{host}:{port}{path_prefix}/_search/scroll"
+    path = f"{path_prefix}/_search/scroll"
 
     headers = {
         'Content-Type': 'application/json',
     }
 
-    if user and password:
-        import base64
-        credentials = base64.b64encode(f"{user}:{password}".encode()).decode()
-        headers['Authorization'] = f'Basic {credentials}'
+    if auth_header:
+        headers['Authorization'] = auth_header
 
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
+    own_conn = conn is None
+    if own_conn:
+        conn = open_connection(host, port, use_ssl, timeout=10)
 
     body = {"scroll_id": scroll_id}
-    req = Request(url, data=json.dumps(body).encode(), headers=headers, method='DELETE')
 
     try:
-        with urlopen(req, context=ctx, timeout=10) as response:
-            pass
+        send_request(conn, 'DELETE', path, _json_dumps(body), headers)
     except:
         pass  # Ignore errors during cleanup
+    finally:
+        if own_conn:
+            conn.close()
 
 def get_total_count(host, port, index, user, password, use_ssl=True, path_prefix=''):
     """Get total document count in index"""
@@ -95,14 +261,51 @@ def get_total_count(host, port, index, user, password, use_ssl=True, path_prefix
         "track_total_hits": True
     }
 
-    result = query_opensearch(host, port, index, user, password, query, use_ssl, path_prefix=path_prefix)
+    result = query_opensearch(host, port, index, basic_auth_header(user, password), query, use_ssl,
+                              path_prefix=path_prefix)
     return result['hits']['total']['value']
 
-def get_message_counters(host, port, index, user, password, use_ssl=True, path_prefix=''):
-    """Extract all message counters and document _ids from the index using scroll API"""
-    counters = []
-    # Map: message_counter -> list of (_id, @timestamp) for duplicate diagnosis
-    counter_to_ids = {}
+def parse_counter(message):
+    """Extract the counter from one message, or None if it has none"""
+    # Fast path: messages are normally exactly "Test message #<n>"
+    tail = message[_COUNTER_PREFIX_LEN:]
+    if message.startswith(_COUNTER_PREFIX) and tail.isdecimal():
+        return int(tail)
+
+    # Reject unrelated messages with a plain substring scan, then search from
+    # the first prefix on (a later occurrence may be the one with digits)
+    pos = message.find(_COUNTER_PREFIX)
+    match = _COUNTER_RE.search(message, pos) if pos >= 0 else None
+    return int(match.group(1)) if match else None
+
+def parse_counters(messages):
+    """Extract the counter from each message (None where there is none)"""
+    # Common case: every message is exactly "Test message #<n>". Joined one per
+    # line, a single findall() extracts the whole page without a Python-level
+    # loop; it lines up with the messages only if none contains a newline and
+    # every line matched.
+    joined = '\n'.join(messages)
+    found = _COUNTER_LINE_RE.findall(joined)
+    if len(found) == len(messages) and joined.count('\n') == len(messages) - 1:
+        return list(map(int, found))
+
+    return [parse_counter(message) for message in messages]
+
+def get_message_counters(host, port, index, user, password, use_ssl=True, path_prefix='', slices=1, occupancy=None):
+    """Extract all message counters and document _ids from the index using scroll API
+
+    Returns parallel sequences (counters as an int64 array, _ids, @timestamps) in fetch order.
+    With slices > 1 the index is read as that many sliced scrolls fetched in parallel.
+    If occupancy (a NumPy array) is given, counters are tallied into it as they
+    arrive (index = counter value) instead; only values beyond its range are
+    returned, and no _ids are collected.
+    """
+    # 8 bytes per counter instead of a list slot plus a boxed int (~36 bytes)
+    counters = array('q')
+    extracted = 0
+    # _id and @timestamp of each counted document, for duplicate diagnosis
+    doc_ids = []
+    timestamps = []
 
     # Initial query with scroll (scroll parameter will be in URL)
     query = {
@@ -111,64 +314,137 @@ def get_message_counters(host, port, index, user, password, use_ssl=True, path_p
         "sort": [{"@timestamp": "asc"}, {"_id": "asc"}],  # Stable sort with _id as tiebreaker
         "_source": ["message", "@timestamp"]
     }
+    filter_path = _SCROLL_FILTER_PATH
+    if occupancy is not None:
+        query["_source"] = ["message"]
+        filter_path = _SCROLL_MESSAGE_FILTER_PATH
 
     def process_hits(hits):
-        for hit in hits:
-            source = hit['_source']
-            message = source.get('message', '')
-            doc_id = hit['_id']
-            timestamp = source.get('@timestamp', '')
-
-            match = re.search(r'Test message #(\d+)', message)
-            if match:
-                counter_val = int(match.group(1))
-                counters.append(counter_val)
-                if counter_val not in counter_to_ids:
-                    counter_to_ids[counter_val] = []
-                counter_to_ids[counter_val].append((doc_id, timestamp))
-
-    # Initial search request with scroll
-    result = query_opensearch(host, port, index, user, password, query, use_ssl, scroll="2m", path_prefix=path_prefix)
-    scroll_id = result.get('_scroll_id')
-    hits = result['hits']['hits']
-
-    process_hits(hits)
-
-    total_fetched = len(hits)
-    batch_count = 1
-
-    # Continue scrolling until no more results
-    while len(hits) > 0:
-        # Scroll to next batch
-        result = query_opensearch(host, port, index, user, password, scroll_id, use_ssl,
-                                  scroll="2m", is_scroll_request=True, path_prefix=path_prefix)
-        scroll_id = result.get('_scroll_id')
-        hits = result['hits']['hits']
-
-        if len(hits) == 0:
-            break
-
-        batch_count += 1
-        total_fetched += len(hits)
-        process_hits(hits)
-
-        # Print progress for large datasets
-        if batch_count % 10 == 0:
-            print(f"  Fetched {total_fetched:,} documents, extracted {len(counters):,} counters...", end='\r')
-
-    # Clear scroll context
-    if scroll_id:
-        clear_scroll(host, port, scroll_id, user, password, use_ssl, path_prefix=path_prefix)
+        nonlocal extracted
+        sources = [hit.get('_source', {}) for hit in hits]
+        page_counters = parse_counters([source.get('message', '') for source in sources])
+
+        keep = [counter_val is not None for counter_val in page_counters]
+
+        if occupancy is not None:
+            page = np.fromiter(compress(page_counters, keep), dtype=np.int64)
+            in_range = page < len(occupancy)
+            np.add.at(occupancy, page[in_range], 1)
+            counters.frombytes(page[~in_range].tobytes())
+            extracted += len(page)
+            return
+
+        extracted += sum(keep)
+        counters.extend(compress(page_counters, keep))
+        doc_ids.extend(compress([hit['_id'] for hit in hits], keep))
+        timestamps.extend(compress([source.get('@timestamp', '') for source in sources], keep))
+
+    # Encoded once for every request of the scroll
+    auth_header = basic_auth_header(user, password)
+
+    # One kept-alive connection per slice instead of a new TCP/TLS handshake per batch.
+    # Requests on a connection never overlap: a slice's next page is only requested
+    # once its previous page has arrived.
+    conns = [open_connection(host, port, use_ssl) for _ in range(slices)]
+    scroll_ids = [None] * slices
+
+    def fetch_first(slice_id):
+        slice_query = dict(query)
+        if slices > 1:
+            slice_query["slice"] = {"id": slice_id, "max": slices}
+        return query_opensearch(host, port, index, auth_header, slice_query, use_ssl, scroll="2m",
+                                path_prefix=path_prefix, conn=conns[slice_id], filter_path=filter_path)
+
+    def fetch_next(slice_id):
+        return query_opensearch(host, port, index, auth_header, scroll_ids[slice_id], use_ssl,
+                                scroll="2m", is_scroll_request=True, path_prefix=path_prefix,
+                                conn=conns[slice_id], filter_path=filter_path)
+
+    total_fetched = 0
+    batch_count = 0
+
+    # Scroll every slice until it runs dry. Each slice's next page is kept in
+    # flight while the current one is parsed, overlapping network round-trips
+    # with counter extraction; parsing itself stays on this thread.
+    with ThreadPoolExecutor(max_workers=slices) as executor:
+        pending = {executor.submit(fetch_first, slice_id): slice_id for slice_id in range(slices)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                slice_id = pending.pop(future)
+                result = future.result()
+                scroll_ids[slice_id] = result.get('_scroll_id')
+                hits = result.get('hits', {}).get('hits', [])
+                if len(hits) == 0:
+                    continue
+
+                pending[executor.submit(fetch_next, slice_id)] = slice_id
+
+                batch_count += 1
+                total_fetched += len(hits)
+                process_hits(hits)
+
+                # Print progress for large datasets
+                if batch_count % 10 == 0:
+                    print(f"  Fetched {total_fetched:,} documents, extracted {extracted:,} counters...", end='\r')
+
+    # Clear scroll contexts
+    for scroll_id, conn in zip(scroll_ids, conns):
+        if scroll_id:
+            clear_scroll(host, port, scroll_id, auth_header, use_ssl, path_prefix=path_prefix, conn=conn)
+        conn.close()
 
     if batch_count > 1:
-        print(f"  Fetched {total_fetched:,} documents, extracted {len(counters):,} counters    ")
+        print(f"  Fetched {total_fetched:,} documents, extracted {extracted:,} counters    ")
+
+    return counters, doc_ids, timestamps
+
+def sort_counters(counters):
+    """Return a sorted copy of counters, as an int64 ndarray when NumPy is available"""
+    if np is not None:
+        # C-level sort on contiguous int64 instead of Timsort over boxed ints;
+        # a copy, since counters stays aligned with the fetched _ids
+        arr = np.array(counters, dtype=np.int64)
+        arr.sort()
+        return arr
+    return sorted(counters)
+
+def group_ids_by_counter(counters, doc_ids, timestamps, wanted):
+    """Map each counter value in wanted to its list of (_id, @timestamp), in @timestamp order"""
+    counter_to_ids = {}
+    for counter_val, doc_id, timestamp in zip(counters, doc_ids, timestamps):
+        if counter_val in wanted:
+            counter_to_ids.setdefault(counter_val, []).append((doc_id, timestamp))
+
+    # Sliced scrolls deliver pages in arrival order, so restore the scroll's
+    # @timestamp, _id sort (only a handful of short lists)
+    for entries in counter_to_ids.values():
+        entries.sort(key=lambda e: (e[1], e[0]))
+    return counter_to_ids
+
+def _summarize_counts(results, uniq, counts):
+    """Fill in duplicate and gap results from sorted unique counter values and their counts"""
+    results['unique_messages'] = len(uniq)
+
+    dup_mask = counts > 1
+    results['duplicates'] = dict(zip(uniq[dup_mask].tolist(), counts[dup_mask].tolist()))
+    results['total_duplicates'] = results['total_messages'] - results['unique_messages']
+
+    gap_pos = np.nonzero(np.diff(uniq) > 1)[0]
+    results['gaps'] = list(zip((uniq[gap_pos] + 1).tolist(), (uniq[gap_pos + 1] - 1).tolist()))
 
-    return sorted(counters), counter_to_ids
+def validate_integrity(counters, expected_count=None, occupancy=None):
+    """Validate message sequence integrity of sorted counters (a sequence or an int64 ndarray)
+
+    occupancy optionally holds per-value counts streamed by get_message_counters;
+    counters then only lists the values beyond its range.
+    """
+    total = len(counters)
+    if occupancy is not None:
+        total += int(occupancy.sum())
 
-def validate_integrity(counters, expected_count=None):
-    """Validate message sequence integrity"""
     results = {
-        'total_messages': len(counters),
+        'total_messages': total,
         'expected_count': expected_count,
         'unique_messages': 0,
         'count_match': False,
@@ -180,39 +456,176 @@ def validate_integrity(counters, expected_count=None):
         'last_counter': None,
     }
 
-    if not counters:
+    if not total:
         return results
 
-    results['first_counter'] = counters[0]
-    results['last_counter'] = counters[-1]
-
-    # Count occurrences of each counter to detect duplicates
-    from collections import Counter
-    counter_counts = Counter(counters)
-    unique_counters = sorted(counter_counts.keys())
-
-    results['unique_messages'] = len(unique_counters)
+    if occupancy is None:
+        results['first_counter'] = int(counters[0])
+        results['last_counter'] = int(counters[-1])
+
+    if occupancy is not None:
+        # Streamed path: counts are already indexed by counter value
+        uniq = np.flatnonzero(occupancy)
+        counts = occupancy[uniq]
+        if len(counters):
+            extra, extra_counts = np.unique(np.asarray(counters, dtype=np.int64), return_counts=True)
+            uniq = np.concatenate((uniq, extra))
+            counts = np.concatenate((counts, extra_counts))
+
+        results['first_counter'] = int(uniq[0])
+        results['last_counter'] = int(uniq[-1])
+        _summarize_counts(results, uniq, counts)
+    elif _scan_sorted is not None:
+        # JIT path: one compiled pass over the already sorted counters
+        unique, dup_vals, dup_counts, gap_starts, gap_ends = _scan_sorted(np.asarray(counters, dtype=np.int64))
+        results['unique_messages'] = unique
+        results['duplicates'] = dict(zip(dup_vals, dup_counts))
+        results['total_duplicates'] = results['total_messages'] - results['unique_messages']
+        results['gaps'] = list(zip(gap_starts, gap_ends))
+    elif np is not None:
+        # Vectorized path: counting and gap detection run in C, no per-counter Python loop
+        arr = np.asarray(counters, dtype=np.int64)
+        first = int(arr[0])
+        if int(arr[-1]) - first < 2 * len(arr):
+            # Dense counter range (the normal case): a flat occupancy array
+            # indexed by counter gives per-value counts without sorting
+            occ = np.bincount(arr - first)
+            present = np.flatnonzero(occ)
+            uniq, counts = present + first, occ[present]
+        else:
+            uniq, counts = np.unique(arr, return_counts=True)
+        _summarize_counts(results, uniq, counts)
+    else:
+        # Counters are sorted, so duplicates are adjacent: a single pass of
+        # integer comparisons finds both duplicates and gaps
+        prev = None
+        run = 0
+        for counter in counters:
+            if counter == prev:
+                run += 1
+                continue
+            if run > 1:
+                results['duplicates'][prev] = run
+            if prev is not None and counter != prev + 1:
+                results['gaps'].append((prev + 1, counter - 1))
+            results['unique_messages'] += 1
+            prev = counter
+            run = 1
+        if run > 1:
+            results['duplicates'][prev] = run
+
+        results['total_duplicates'] = results['total_messages'] - results['unique_messages']
 
     # Check count against expected (using unique messages)
     if expected_count:
         results['count_match'] = (results['unique_messages'] == expected_count)
 
-    # Check for duplicates
-    for val, count in counter_counts.items():
-        if count > 1:
-            results['duplicates'][val] = count
-            results['total_duplicates'] += count - 1  # extra copies
-            results['sequence_valid'] = False
-
-    # Check for gaps using unique sorted counters
-    prev = unique_counters[0] - 1
-    for counter in unique_counters:
-        if counter != prev + 1:
-            gap_start = prev + 1
-            gap_end = counter - 1
-            results['gaps'].append((gap_start, gap_end))
-            results['sequence_valid'] = False
-        prev = counter
+    results['sequence_valid'] = not results['duplicates'] and not results['gaps']
+
+    return results
+
+def get_integrity_via_agg(host, port, index, user, password, expected_count=None, use_ssl=True, path_prefix=''):
+    """Compute validate_integrity() results server-side, without retrieving documents
+
+    A block whose document count and distinct count both equal its width holds
+    each of its counters exactly once; exact counts are only fetched for the other
+    blocks. Returns None if more than _AGG_MAX_EXACT_BLOCKS blocks need them.
+    """
+    auth_header = basic_auth_header(user, password)
+    # Aggregating a large index can take well over the default request timeout
+    conn = open_connection(host, port, use_ssl, timeout=600)
+
+    def aggregate(aggs):
+        result = query_opensearch(host, port, index, auth_header, {"size": 0, "aggs": aggs}, use_ssl,
+                                  path_prefix=path_prefix, conn=conn, filter_path='aggregations')
+        return result['aggregations']
+
+    counter_script = {"source": _AGG_COUNTER_SCRIPT}
+    overview = aggregate({
+        "first": {"min": {"script": counter_script}},
+        "last": {"max": {"script": counter_script}},
+        "blocks": {
+            "histogram": {"script": counter_script, "interval": _AGG_BLOCK, "min_doc_count": 1},
+            "aggs": {
+                "distinct": {
+                    "scripted_metric": {
+                        "params": {"block": _AGG_BLOCK, "words": (_AGG_BLOCK + 63) // 64},
+                        "init_script": "state.bits = new long[params.words]",
+                        "map_script": _AGG_BITS_MAP_SCRIPT,
+                        "combine_script": "return state.bits",
+                        # Aggregation-level params don't reach the reduce script
+                        "reduce_script": {"source": _AGG_BITS_REDUCE_SCRIPT,
+                                          "params": {"words": (_AGG_BLOCK + 63) // 64}},
+                    }
+                }
+            }
+        }
+    })
+
+    blocks = []
+    buckets = overview['blocks']['buckets']
+    if buckets:
+        first = int(overview['first']['value'])
+        last = int(overview['last']['value'])
+        for bucket in buckets:
+            lo = max(int(bucket['key']), first)
+            hi = min(int(bucket['key']) + _AGG_BLOCK - 1, last)
+            width = hi - lo + 1
+            complete = bucket['doc_count'] == width and bucket['distinct']['value'] == width
+            blocks.append((lo, hi, bucket['doc_count'], complete))
+
+    if sum(1 for block in blocks if not block[3]) > _AGG_MAX_EXACT_BLOCKS:
+        conn.close()
+        return None
+
+    total = 0
+    unique = 0
+    gaps = []
+    duplicates = {}
+    prev = None
+    for lo, hi, doc_count, complete in blocks:
+        total += doc_count
+        if complete:
+            runs = [(lo, hi, 1)]
+        else:
+            # A block has at most _AGG_BLOCK distinct counters, so a single page
+            # of composite keys after lo - 1 covers all of them
+            values = aggregate({
+                "values": {
+                    "composite": {
+                        "size": _AGG_BLOCK,
+                        "sources": [{"counter": {"terms": {"script": counter_script, "value_type": "long"}}}],
+                        "after": {"counter": lo - 1},
+                    }
+                }
+            })['values']['buckets']
+            runs = [(int(b['key']['counter']), int(b['key']['counter']), b['doc_count'])
+                    for b in values if int(b['key']['counter']) <= hi]
+
+        for start, end, count in runs:
+            if prev is not None and start != prev + 1:
+                gaps.append((prev + 1, start - 1))
+            unique += end - start + 1
+            if count > 1:
+                duplicates[start] = count
+            prev = end
+    conn.close()
+
+    results = {
+        'total_messages': total,
+        'expected_count': expected_count,
+        'unique_messages': unique,
+        'count_match': False,
+        'sequence_valid': not gaps and not duplicates,
+        'gaps': gaps,
+        'duplicates': duplicates,
+        'total_duplicates': total - unique,
+        'first_counter': blocks[0][0] if blocks else None,
+        'last_counter': blocks[-1][1] if blocks else None,
+    }
+
+    if expected_count:
+        results['count_match'] = (results['unique_messages'] == expected_count)
 
     return results
 
@@ -227,6 +640,11 @@ def main():
     parser.add_argument('--no-ssl', action='store_true', help='Disable SSL')
     parser.add_argument('--path-prefix', default='', help='URL path prefix (e.g. /os for reverse proxy)')
     parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    parser.add_argument('--slices', type=int, default=1,
+                        help='Number of sliced scrolls to fetch in parallel (default: 1)')
+    parser.add_argument('--agg-only', action='store_true',
+                        help='Validate with a server-side aggregation instead of fetching documents '
+                             '(skips the Generate_ID duplicate diagnosis)')
 
     args = parser.parse_args()
 
@@ -246,14 +664,35 @@ def main():
             print(f"Expected count: {args.expected_count}")
         print()
 
-    # Extract counters
-    if not args.json:
-        print("Extracting message counters...")
+    results = None
+    counters, doc_ids, timestamps = [], [], []
+    if args.agg_only:
+        if not args.json:
+            print("Aggregating message counters on the server...")
+
+        results = get_integrity_via_agg(args.host, args.port, args.index, args.user, args.password,
+                                        args.expected_count, use_ssl, path_prefix=args.path_prefix)
+        if results is None and not args.json:
+            print("Too many incomplete counter blocks to aggregate, fetching documents instead...")
+    results_from_agg = results is not None
+
+    if results is None:
+        # Extract counters
+        if not args.json:
+            print("Extracting message counters...")
+
+        # The JSON report needs no _ids, so given NumPy and an expected count the
+        # counters are tallied into a flat per-value array as they stream in
+        occupancy = None
+        if args.json and np is not None and args.expected_count:
+            occupancy = np.zeros(args.expected_count + 1, dtype=np.uint32)
 
-    counters, counter_to_ids = get_message_counters(args.host, args.port, args.index, args.user, args.password, use_ssl, path_prefix=args.path_prefix)
+        counters, doc_ids, timestamps = get_message_counters(args.host, args.port, args.index, args.user, args.password,
+                                                             use_ssl, path_prefix=args.path_prefix,
+                                                             slices=max(1, args.slices), occupancy=occupancy)
 
-    # Validate
-    results = validate_integrity(counters, args.expected_count)
+        # Validate
+        results = validate_integrity(sort_counters(counters), args.expected_count, occupancy=occupancy)
 
     if args.json:
         # Convert duplicates dict keys to strings for JSON serialization
@@ -277,18 +716,22 @@ def main():
             dup_ratio = results['total_messages'] / results['unique_messages'] if results['unique_messages'] > 0 else 0
             print(f"\nDuplicates: {results['total_duplicates']:,} extra copies ({dup_ratio:.1f}x average duplication)")
             # Show the most duplicated counters
-            sorted_dups = sorted(results['duplicates'].items(), key=lambda x: -x[1])
+            sorted_dups = heapq.nlargest(10, results['duplicates'].items(), key=lambda x: x[1])
             print(f"Most duplicated values (showing top 10 of {len(results['duplicates']):,}):")
-            for val, count in sorted_dups[:10]:
+            for val, count in sorted_dups:
                 print(f"  - Counter {val}: {count} copies")
-            if len(sorted_dups) > 10:
-                print(f"  ... and {len(sorted_dups) - 10} more")
+            if len(results['duplicates']) > 10:
+                print(f"  ... and {len(results['duplicates']) - 10} more")
 
             # Diagnose Generate_ID effectiveness: do duplicates share _id?
             print(f"\n--- Generate_ID Diagnosis ---")
+            if results_from_agg:
+                print("  Skipped: --agg-only does not fetch document _ids")
             same_id_count = 0
             diff_id_count = 0
-            sample_dups = sorted_dups[:5]  # Examine top 5 duplicated counters
+            sample_dups = [] if results_from_agg else sorted_dups[:5]  # Examine top 5 duplicated counters
+            # Only the sampled counters need their _ids, so group just those
+            counter_to_ids = group_ids_by_counter(counters, doc_ids, timestamps, {val for val, _ in sample_dups})
             for val, count in sample_dups:
                 entries = counter_to_ids.get(val, [])
                 ids = [e[0] for e in entries]